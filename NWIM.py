@@ -1,54 +1,148 @@
 import requests
 import csv
+import functools
+import io
 import json
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Prefer orjson, then ujson, then the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+if orjson is not None:
+    _JSONDecodeError = orjson.JSONDecodeError
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+elif ujson is not None:
+    _JSONDecodeError = getattr(ujson, "JSONDecodeError", ValueError)
+
+    def _loads(data):
+        return ujson.loads(data)
+
+    def _dumps(obj):
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode()
+else:
+    _JSONDecodeError = json.JSONDecodeError
+
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
 
 log_file = "logger.log"
 unit_mapping_file = "unit_mapping.json"
 
+# Keep a single handle on the log file instead of reopening it for every message;
+# delay=True leaves the file unopened until the first message is logged
+logger = logging.getLogger("nwim")
+_log_handler = logging.FileHandler(log_file, delay=True)
+_log_handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+logger.addHandler(_log_handler)
+logger.setLevel(logging.INFO)
+# Don't echo incident lines through handlers a caller installs on the root logger
+logger.propagate = False
+
+# Incident types that are never forwarded to the DC API
+_EXCLUDED_TYPES = frozenset({
+    "Miscellaneous", "Resource Order", "Aircraft", "False Alarm", "Classroom Training",
+    "Preparedness/Preposition", "N/A", "Resource Program (internal)", "Emergency Stabilization", "Nonstatistical Fire",
+})
+
+# Maps newlines and carriage returns to spaces in a single str.translate pass
+_NEWLINE_TABLE = str.maketrans({'\n': ' ', '\r': ' '})
+
+# Shared session so repeated calls to the same hosts reuse pooled connections
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.3))
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# Output directories already created during this run
+_ENSURED_DIRS = set()
+
+# Guards the unit state while centers are processed concurrently
+unit_mapping_lock = threading.Lock()
+
 def load_config(config_file="config.json"):
     if not os.path.exists(config_file):
         log_message(f"Config file {config_file} does not exist.")
         return None
-    with open(config_file, "r") as file:
-        return json.load(file)
+    with open(config_file, "rb") as file:
+        return _loads(file.read())
 
 def log_message(message):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_file, "a") as file:
-        file.write(f"{timestamp} - {message}\n")
+    logger.info(message)
 
 def fetch_data(url, headers):
     try:
         log_message(f"Fetching data from URL: {url}")
-        response = requests.get(url, headers=headers, timeout=10)
+        response = SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     except requests.RequestException as e:
         log_message(f"Request failed for URL: {url}. Error: {e}")
         return None
+    except _JSONDecodeError as e:
+        log_message(f"Invalid JSON received from URL: {url}. Error: {e}")
+        return None
 
-def is_valid_lat_long(incident):
-    try:
-        float(incident.get('latitude'))
-        float(incident.get('longitude'))
-        return True
-    except (TypeError, ValueError):
+def _try_float(value):
+    # Check the shape of the string first so bad values skip float()'s exception path
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    digits = value[1:] if value.startswith('-') else value
+    if not digits.replace('.', '', 1).isdecimal():
+        return None
+    return float(value)
+
+def parse_lat_long(incident):
+    # Returns the parsed (latitude, longitude) floats, or None if either is invalid
+    latitude = _try_float(incident.get('latitude'))
+    longitude = _try_float(incident.get('longitude'))
+    if latitude is None or longitude is None:
         log_message(f"No valid lat long for incident: {incident.get('uuid')} Name: {incident.get('name')}")
-        return False
+        return None
+    return latitude, longitude
 
-def is_recent_incident(incident_date, age_limit_months):
+@functools.lru_cache(maxsize=8192)
+def _parse_incident_dt(incident_date):
     try:
+        incident_datetime = datetime.fromisoformat(incident_date)
+    except ValueError:
+        # Older Pythons only accept 3 or 6 fractional digits
         try:
-            incident_datetime = datetime.strptime(incident_date, "%Y-%m-%dT%H:%M:%S.%f")
+            return datetime.strptime(incident_date, "%Y-%m-%dT%H:%M:%S.%f")
         except ValueError:
-            incident_datetime = datetime.strptime(incident_date, "%Y-%m-%dT%H:%M:%S")
-        
-        now = datetime.now()
-        age_limit = now - relativedelta(months=age_limit_months)
-        return incident_datetime > age_limit
+            return datetime.strptime(incident_date, "%Y-%m-%dT%H:%M:%S")
+    if incident_datetime.tzinfo is not None:
+        # Compare against the naive local datetime.now() cutoffs
+        incident_datetime = incident_datetime.astimezone().replace(tzinfo=None)
+    return incident_datetime
+
+def is_recent_incident(incident_date, age_limit):
+    try:
+        return _parse_incident_dt(incident_date) > age_limit
     except ValueError:
         return False
 
@@ -59,52 +153,48 @@ def get_status_code(fire_status):
     else:
         return "OnScene"
 
-def process_incident(incident, center_code, agency, age_limit_months):
+def process_incident(incident, center_code, agency, age_limit, coordinates):
     incident_id = incident.get('uuid')
     if not incident_id:
         return None
 
-    if not is_recent_incident(incident.get('date'), age_limit_months):
+    incident_date = incident.get('date')
+    if not is_recent_incident(incident_date, age_limit):
         return None
 
     fiscal_data = incident.get('fiscal_data', {})
     if isinstance(fiscal_data, str):
         try:
-            fiscal_data = json.loads(fiscal_data)
-        except json.JSONDecodeError:
+            fiscal_data = _loads(fiscal_data)
+        except _JSONDecodeError:
             fiscal_data = {}
             log_message(f"Failed to decode fiscal_data JSON for incident id {incident_id}")
 
     fire_status = incident.get('fire_status', {})
     if isinstance(fire_status, str):
         try:
-            fire_status = json.loads(fire_status)
-        except json.JSONDecodeError:
+            fire_status = _loads(fire_status)
+        except _JSONDecodeError:
             fire_status = {}
             log_message(f"Failed to decode fire_status JSON for incident id {incident_id}")
 
-    # Add negative sign to longitude if not already there
-    longitude = incident.get('longitude', '')
-    if longitude and not longitude.startswith('-'):
-        longitude = '-' + longitude
+    # Pull every field we need out of the nested dicts once
+    fire_contain = fire_status.get('contain')
+    fire_control = fire_status.get('control')
+    fire_out = fire_status.get('out')
+
+    # Render both coordinates from the parsed floats; longitudes are always west, so force them negative
+    latitude, longitude = coordinates
+    longitude = -abs(longitude) or 0.0
 
     # Remove returns from webComment and fiscal_comments fields
     web_comment = incident.get('webComment', '') or ''
-    web_comment = web_comment.replace('\n', ' ').replace('\r', ' ')
+    web_comment = web_comment.translate(_NEWLINE_TABLE)
     
     fiscal_comments = fiscal_data.get('fiscal_comments', '') or ''
-    fiscal_comments = fiscal_comments.replace('\n', ' ').replace('\r', ' ')
+    fiscal_comments = fiscal_comments.translate(_NEWLINE_TABLE)
 
     # Determine the new incidentTypeDescription based on fire status
-    fire_contain = fire_status.get('contain')
-    fire_control = fire_status.get('control')
-    fire_out = fire_status.get('out')
-
-    if fire_out is not None:
-        clear_datetime = fire_out
-    else:
-        clear_datetime = None
-
     if fire_contain and not fire_control and not fire_out:
         incident_type_description = "Wildfire Contained"
     elif fire_contain and fire_control and not fire_out:
@@ -115,21 +205,21 @@ def process_incident(incident, center_code, agency, age_limit_months):
     processed_incident = {
         "agency": agency,
         "jurisdiction": center_code,
-        "incidentId": incident.get('uuid'),
+        "incidentId": incident_id,
         "alternateId": incident.get('inc_num'),
         "incidentTypeDescription": incident_type_description,
-        "latitude": incident.get('latitude'),
-        "longitude": longitude,
-        "statusUpdatedDatetime": incident.get('date', 'Unknown'),
-        "clearDatetime": clear_datetime,
+        "latitude": repr(latitude),
+        "longitude": repr(longitude),
+        "statusUpdatedDatetime": incident_date,
+        "clearDatetime": fire_out,
         "narrative": web_comment,
         "name": incident.get('name'),
         "ic": incident.get('ic'),
         "acres": incident.get('acres'),
         "fuels": incident.get('fuels'),
-        "fire_out": fire_status.get('out'),
-        "fire_contain": fire_status.get('contain'),
-        "fire_control": fire_status.get('control'),
+        "fire_out": fire_out,
+        "fire_contain": fire_contain,
+        "fire_control": fire_control,
         "fire_code": fiscal_data.get('fire_code'),
         "wfdssunit": fiscal_data.get('wfdssunit'),
         "fs_job_code": fiscal_data.get('fs_job_code'),
@@ -141,60 +231,74 @@ def process_incident(incident, center_code, agency, age_limit_months):
 
     return processed_incident
 
-def is_old_prescribed_fire(incident):
+def is_old_prescribed_fire(incident, ninety_days_ago):
     if incident.get('type') == "Prescribed Fire":
-        try:
-            incident_datetime = datetime.strptime(incident.get('date'), "%Y-%m-%dT%H:%M:%S.%f")
-        except ValueError:
-            incident_datetime = datetime.strptime(incident.get('date'), "%Y-%m-%dT%H:%M:%S")
-        
-        now = datetime.now()
-        ninety_days_ago = now - relativedelta(days=90)
-        return incident_datetime < ninety_days_ago
+        return _parse_incident_dt(incident.get('date')) < ninety_days_ago
     return False
 
-def get_next_unit_id(available_units, unit_mapping):
+def get_next_unit_id(unit_state):
+    available_units = unit_state['available']
     if available_units:
-        return available_units.pop(0)
-    used_ids = set(unit_mapping.values())
-    i = 1
-    while f"FixedUnit{i}" in used_ids:
-        i += 1
-    return f"FixedUnit{i}"
-
-def process_center_data(center_code, center_response, all_center_data, agency, age_limit_months, unit_mapping, available_units):
+        return available_units.pop()
+    unit_id = f"FixedUnit{unit_state['next']}"
+    unit_state['next'] += 1
+    return unit_id
+
+def release_stale_units(unit_state, seen_incidents):
+    # Units of incidents that no center reported this run go back on the stack for reuse
+    unit_mapping = unit_state['mapping']
+    available_units = unit_state['available']
+    stale_incidents = [incident_id for incident_id in unit_mapping if incident_id not in seen_incidents]
+    for incident_id in stale_incidents:
+        available_units.append(unit_mapping[incident_id])
+        del unit_mapping[incident_id]
+    return len(stale_incidents)
+
+def process_center_data(center_code, center_response, all_center_data, agency, age_limit_months, unit_state):
+    if not isinstance(center_response, list):
+        return set(), {}
+
+    unit_mapping = unit_state['mapping']
     current_uuids = set()
     incident_dict = {}
-    if isinstance(center_response, list):
-        for center_data in center_response:
-            if 'data' not in center_data or not isinstance(center_data['data'], list):
+
+    # Compute the cutoffs once per center instead of once per incident
+    now = datetime.now()
+    age_limit = now - relativedelta(months=age_limit_months)
+    ninety_days_ago = now - relativedelta(days=90)
+
+    # Resolve the center's bucket and bound methods once, outside the incident loop
+    bucket_append = all_center_data.setdefault(center_code, []).append
+    add_uuid = current_uuids.add
+
+    for center_data in center_response:
+        if 'data' not in center_data or not isinstance(center_data['data'], list):
+            continue
+
+        # Filter and process in a single pass instead of building a filtered list first
+        for incident in center_data['data']:
+            if incident.get('type') in _EXCLUDED_TYPES:
+                continue
+            coordinates = parse_lat_long(incident)
+            if not coordinates:
+                continue
+            if is_old_prescribed_fire(incident, ninety_days_ago):
+                continue
+
+            processed_incident = process_incident(incident, center_code, agency, age_limit, coordinates)
+            if not processed_incident:
                 continue
 
-            filtered_incidents = [
-                incident for incident in center_data['data']
-                if incident['type'] not in {"Miscellaneous", "Resource Order", "Aircraft", "False Alarm", "Classroom Training", "Preparedness/Preposition", "N/A", "Resource Program (internal)", "Emergency Stabilization","Nonstatistical Fire"}
-                and is_valid_lat_long(incident)
-                and not is_old_prescribed_fire(incident)
-            ]
-
-            if center_code not in all_center_data:
-                all_center_data[center_code] = []
-
-            for incident in filtered_incidents:
-                processed_incident = process_incident(incident, center_code, agency, age_limit_months)
-                if processed_incident:
-                    current_uuids.add(processed_incident["incidentId"])
-                    all_center_data[center_code].append(processed_incident)
-                    incident_dict[processed_incident["incidentId"]] = processed_incident
-
-                    # Update or create unit mapping
-                    if processed_incident["incidentId"] not in unit_mapping:
-                        unit_mapping[processed_incident["incidentId"]] = get_next_unit_id(available_units, unit_mapping)
-                    else:
-                        # If the incident has clearDatetime, release the unit for reuse
-                        if processed_incident["clearDatetime"] is not None:
-                            available_units.append(unit_mapping[processed_incident["incidentId"]])
-                            del unit_mapping[processed_incident["incidentId"]]
+            incident_id = processed_incident["incidentId"]
+            add_uuid(incident_id)
+            bucket_append(processed_incident)
+            incident_dict[incident_id] = processed_incident
+
+            # Create a unit mapping for new incidents. A cleared incident keeps its own
+            # unit while it is still in the feed, since its unit row is reported as Avail;
+            # releasing it here only handed the same ids back in a different order
+            if incident_id not in unit_mapping:
+                unit_mapping[incident_id] = get_next_unit_id(unit_state)
 
     return current_uuids, incident_dict
 
@@ -210,6 +314,11 @@ def generate_unit_data(agency, unit_id, incident_id, status_code, latitude, long
         "gpsFixDatetime": gpsFixDatetime
     }
 
+def _ensure_dir(path):
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
 def save_to_txt(center_code, data, file_prefix):
     if not data:
         log_message(f"No data to save for {center_code}.")
@@ -217,14 +326,18 @@ def save_to_txt(center_code, data, file_prefix):
     
     keys = data[0].keys()
     directory = os.path.join("DC", center_code)
-    os.makedirs(directory, exist_ok=True)
+    _ensure_dir(directory)
     file_name = os.path.join(directory, f"{file_prefix}_{center_code}.txt")
     
+    # Render the whole file in memory so it reaches disk in a single write
+    buffer = io.StringIO(newline='')
+    dict_writer = csv.DictWriter(buffer, fieldnames=keys, delimiter='\t')
+    dict_writer.writeheader()
+    dict_writer.writerows(data)
+
     try:
         with open(file_name, "w", newline='') as output_file:
-            dict_writer = csv.DictWriter(output_file, fieldnames=keys, delimiter='\t')
-            dict_writer.writeheader()
-            dict_writer.writerows(data)
+            output_file.write(buffer.getvalue())
         log_message(f"Data saved to {file_name}")
     except IOError as e:
         log_message(f"Error: Could not write to {file_name}. Error: {e}")
@@ -234,38 +347,74 @@ def save_to_txt(center_code, data, file_prefix):
 def save_to_json(data, file_name):
     try:
         directory = "fetched"
-        os.makedirs(directory, exist_ok=True)
+        _ensure_dir(directory)
         file_name = os.path.join(directory, file_name)
         
-        with open(file_name, "w") as json_file:
-            json.dump(data, json_file, indent=4)
+        with open(file_name, "wb") as json_file:
+            json_file.write(_dumps(data))
         log_message(f"Fetched data saved to {file_name}")
     except IOError as e:
         log_message(f"Error: Could not write to {file_name}. Error: {e}")
 
+class UnitMapping(dict):
+    # Remembers whether the mapping changed since it was last saved so unchanged runs can skip rewriting it
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty = False
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.dirty = True
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.dirty = True
+
 def load_unit_mapping():
+    saved = {}
     if os.path.exists(unit_mapping_file):
-        with open(unit_mapping_file, "r") as file:
-            return json.load(file)
-    return {}
-
-def save_unit_mapping(unit_mapping):
-    with open(unit_mapping_file, "w") as file:
-        json.dump(unit_mapping, file, indent=4)
+        with open(unit_mapping_file, "rb") as file:
+            saved = _loads(file.read())
+
+    if isinstance(saved.get('mapping'), dict):
+        return {
+            'mapping': UnitMapping(saved['mapping']),
+            'available': saved.get('available', []),
+            'next': saved['next'],
+        }
+
+    # Older files are a flat incident -> unit mapping; start the counter after the highest number in use
+    unit_mapping = saved
+    numbers = {int(unit_id[len("FixedUnit"):]) for unit_id in unit_mapping.values()
+               if unit_id.startswith("FixedUnit") and unit_id[len("FixedUnit"):].isdigit()}
+    next_unit = max(numbers, default=0) + 1
+    # Unused numbers below the counter were released by earlier runs; keep the lowest on top of the stack
+    available_units = [f"FixedUnit{i}" for i in range(next_unit - 1, 0, -1) if i not in numbers]
+    return {'mapping': UnitMapping(unit_mapping), 'available': available_units, 'next': next_unit}
+
+def save_unit_mapping(unit_state):
+    unit_mapping = unit_state['mapping']
+    # Write to a temporary file and swap it in so a crash never leaves a truncated mapping
+    tmp_file = f"{unit_mapping_file}.tmp"
+    with open(tmp_file, "wb") as file:
+        file.write(_dumps({'mapping': unit_mapping, 'available': unit_state['available'], 'next': unit_state['next']}))
+        # Flush to disk first so a power loss cannot persist the rename without the data
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_file, unit_mapping_file)
+    unit_mapping.dirty = False
 
 def send_to_dc_api(incident_file, unit_file, dc_api_url, dc_api_key, dc_api_secret):
     if not incident_file or not unit_file:
         log_message("No files to send to DC API.")
         return
     
-    files = {
-        'incidents': open(incident_file, 'rb'),
-        'units': open(unit_file, 'rb')
-    }
     data = {'type': 'sitstat', 'agency': 'CoStateTest'}
     
     try:
-        response = requests.post(dc_api_url, auth=(dc_api_key, dc_api_secret), files=files, data=data)
+        with open(incident_file, 'rb') as incidents, open(unit_file, 'rb') as units:
+            files = {'incidents': incidents, 'units': units}
+            response = SESSION.post(dc_api_url, auth=(dc_api_key, dc_api_secret), files=files, data=data, timeout=30)
         if response.status_code == 200:
             log_message('Files sent to DC API successfully')
         else:
@@ -273,6 +422,45 @@ def send_to_dc_api(incident_file, unit_file, dc_api_url, dc_api_key, dc_api_secr
     except Exception as e:
         log_message(f"Error while sending files to DC API: {e}")
 
+def process_one_center(center_code, api_link, headers, agency, age_limit_months, dc_api_link, dc_api_key, dc_api_secret, all_center_data, unit_state):
+    request_url = api_link.replace("{center_code}", center_code)
+    center_response = fetch_data(request_url, headers)
+    if not center_response:
+        log_message(f"No data received for center code {center_code}. Moving to next center code.")
+        return None
+
+    log_message(f"Fetched data: {_dumps(center_response)[:1000].decode(errors='replace')}...")  # Log first 1000 characters of the response
+    save_to_json(center_response, f"{center_code}_fetched_data.json")
+
+    unit_data = []
+    with unit_mapping_lock:
+        current_uuids, incident_dict = process_center_data(center_code, center_response, all_center_data, agency, age_limit_months, unit_state)
+
+        # Generate unit data for each incident; process_center_data has mapped every one of them
+        unit_mapping = unit_state['mapping']
+        for incident in incident_dict.values():
+            incident_id = incident["incidentId"]
+            unit_id = unit_mapping[incident_id]
+            status_updated_datetime = incident["statusUpdatedDatetime"]
+            unit = generate_unit_data(agency, unit_id, incident_id, get_status_code(incident["fire_status"]), incident["latitude"], incident["longitude"], status_updated_datetime, status_updated_datetime)
+            unit_data.append(unit)
+
+    # Save the center's data to a TXT file
+    if center_code in all_center_data and all_center_data[center_code]:
+        save_to_txt(center_code, all_center_data[center_code], "Incidents")
+
+    # Save unit data to a TXT file for each center code
+    if unit_data:
+        save_to_txt(center_code, unit_data, "Units")
+
+    # Send the files to the DC API
+    incident_file = f"DC/{center_code}/Incidents_{center_code}.txt"
+    unit_file = f"DC/{center_code}/Units_{center_code}.txt"
+    if os.path.exists(incident_file) and os.path.exists(unit_file):
+        send_to_dc_api(incident_file, unit_file, dc_api_link, dc_api_key, dc_api_secret)
+
+    return center_code, current_uuids
+
 def main():
     config = load_config()
     if not config:
@@ -294,56 +482,42 @@ def main():
     all_center_data = {}
     change_log = {}
 
-    # Load the unit mapping and initialize available units
-    unit_mapping = load_unit_mapping()
-    available_units = []
-
-    for center_code in center_codes:
-        request_url = api_link.replace("{center_code}", center_code)
-        center_response = fetch_data(request_url, headers)
-        if not center_response:
-            log_message(f"No data received for center code {center_code}. Moving to next center code.")
-            continue
-        
-        log_message(f"Fetched data: {json.dumps(center_response)[:1000]}...")  # Log first 1000 characters of the response
-        save_to_json(center_response, f"{center_code}_fetched_data.json")
-        current_uuids, incident_dict = process_center_data(center_code, center_response, all_center_data, agency, age_limit_months, unit_mapping, available_units)
-        total = len(current_uuids)
-        change_log[center_code] = {'total': total}
-
-        unit_data = []
-
-        # Generate unit data for each incident
-        for incident_id in current_uuids:
-            unit_id = unit_mapping.get(incident_id)
-            if not unit_id:
-                unit_id = get_next_unit_id(available_units, unit_mapping)
-                unit_mapping[incident_id] = unit_id
-            
-            status_code = get_status_code(incident_dict[incident_id].get("fire_status", {}))
-            latitude = incident_dict[incident_id].get("latitude")
-            longitude = incident_dict[incident_id].get("longitude")
-            status_updated_datetime = incident_dict[incident_id].get("statusUpdatedDatetime")
-            gpsFixDatetime = incident_dict[incident_id].get("statusUpdatedDatetime")
-            unit = generate_unit_data(agency, unit_id, incident_id, status_code, latitude, longitude, status_updated_datetime, gpsFixDatetime)
-            unit_data.append(unit)
-
-        # Save the center's data to a TXT file
-        if center_code in all_center_data and all_center_data[center_code]:
-            save_to_txt(center_code, all_center_data[center_code], "Incidents")
-
-        # Save unit data to a TXT file for each center code
-        if unit_data:
-            save_to_txt(center_code, unit_data, "Units")
-
-        # Send the files to the DC API
-        incident_file = f"DC/{center_code}/Incidents_{center_code}.txt"
-        unit_file = f"DC/{center_code}/Units_{center_code}.txt"
-        if os.path.exists(incident_file) and os.path.exists(unit_file):
-            send_to_dc_api(incident_file, unit_file, dc_api_link, dc_api_key, dc_api_secret)
+    # Load the unit mapping along with the released units and id counter
+    unit_state = load_unit_mapping()
+
+    seen_incidents = set()
+    all_centers_fetched = True
+
+    # Centers are independent network round-trips, so fetch and upload them concurrently
+    with ThreadPoolExecutor(max_workers=min(16, len(center_codes))) as pool:
+        futures = [
+            pool.submit(process_one_center, center_code, api_link, headers, agency, age_limit_months, dc_api_link, dc_api_key, dc_api_secret, all_center_data, unit_state)
+            for center_code in center_codes
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if result:
+                center_code, current_uuids = result
+                change_log[center_code] = {'total': len(current_uuids)}
+                seen_incidents |= current_uuids
+            else:
+                all_centers_fetched = False
+
+    # A center that failed to fetch would make all of its incidents look stale
+    if all_centers_fetched:
+        released = release_stale_units(unit_state, seen_incidents)
+        if released:
+            log_message(f"Released {released} units from incidents no longer in any center's feed")
+    else:
+        log_message("Not releasing units because some centers returned no data.")
 
     # Save the updated unit mapping
-    save_unit_mapping(unit_mapping)
+    # Units are taken from the stack or the counter only in process_center_data when it maps
+    # a new incident, and pushed back only by release_stale_units when it unmaps one,
+    # so the mapping's dirty flag also covers the stack and the counter
+    if unit_state['mapping'].dirty:
+        save_unit_mapping(unit_state)
+    SESSION.close()
 
     log_message(f"Changes log: {change_log}")
 